@@ -332,8 +332,7 @@ var NGLView = widgets.DOMWidgetView.extend({
                     max: this.model.get( "count" ) - 1,
                     slide: function( event, ui ){
                         pause();
-                        this.model.set( "frame", ui.value );
-                        this.model.save();
+                        this.setFrameThrottled( ui.value );
                     }.bind( this )
                 } );
             this.$player = $( "<div></div>" )
@@ -353,6 +352,27 @@ var NGLView = widgets.DOMWidgetView.extend({
         }
     },
 
+    setFrameThrottled: function( frame ){
+        // dragging the slider fires faster than frames can be sent and rendered,
+        // set "frame" at most once per 16 ms; the last value is always set
+        this._pendingFrame = frame;
+        if( this._frameTimeout !== undefined ){
+            return;
+        }
+        var flush = function(){
+            this._frameTimeout = undefined;
+            this._frameSetTime = Date.now();
+            this.model.set( "frame", this._pendingFrame );
+            this.model.save();
+        }.bind( this );
+        var wait = ( this._frameSetTime || 0 ) + 16 - Date.now();
+        if( wait > 0 ){
+            this._frameTimeout = setTimeout( flush, wait );
+        }else{
+            flush();
+        }
+    },
+
     countChanged: function() {
         var count = this.model.get( "count" );
         this.$playerSlider.slider( { max: count - 1} );
@@ -513,6 +533,34 @@ var NGLView = widgets.DOMWidgetView.extend({
        component1.superpose(component0, align, sele0, sele1);
     },
 
+    appendChunk: function( streamId, kwargs, buffers ){
+        // collect file content sent by NGLWidget._load_data_streaming
+        this._streams = this._streams || {};
+        if( !this._streams[ streamId ] ){
+            this._streams[ streamId ] = [];
+        }
+        this._streams[ streamId ].push( buffers[ 0 ] );
+    },
+
+    loadStream: function( streamId, binary, kwargs ){
+        this._streams = this._streams || {};
+        var chunks = this._streams[ streamId ] || [];
+        delete this._streams[ streamId ];
+        var type = binary ? "application/octet-binary" : "text/plain";
+        this.stage.loadFile( new Blob( chunks, { type: type } ), kwargs );
+    },
+
+    setVisibilityBulk: function( visibilities ){
+        // visibilities[ i ] is the visibility of i-th component
+        var compList = this.stage.compList;
+        var n = Math.min( visibilities.length, compList.length );
+        for( var i = 0; i < n; i++ ){
+            if( compList[ i ].visible !== visibilities[ i ] ){
+                compList[ i ].setVisibility( visibilities[ i ] );
+            }
+        }
+    },
+
     decode_base64: function(base64) {
         // lightly adapted from Niklas
 
@@ -554,6 +602,56 @@ var NGLView = widgets.DOMWidgetView.extend({
         return arraybuffer;
     },
 
+    dequantize: function( quantized, scale, offset ) {
+        // coordinates = quantized * scale + offset, per axis
+        var n = quantized.length;
+        var coordinates = new Float32Array( n );
+        for( var i = 0; i < n; i += 3 ){
+            coordinates[ i ] = quantized[ i ] * scale[ 0 ] + offset[ 0 ];
+            coordinates[ i + 1 ] = quantized[ i + 1 ] * scale[ 1 ] + offset[ 1 ];
+            coordinates[ i + 2 ] = quantized[ i + 2 ] * scale[ 2 ] + offset[ 2 ];
+        }
+        return coordinates;
+    },
+
+    interpolateCoordinates: function( coordinates, model, iparams ) {
+        // linear interpolation from the previous frame of this model to
+        // `coordinates`, one step per animation frame (see player.js_interpolate)
+        this._lastCoordinates = this._lastCoordinates || {};
+        this._interpolationIds = this._interpolationIds || {};
+        var end = new Float32Array( coordinates );
+        var start = this._lastCoordinates[ model ];
+        var steps = iparams.steps || 1;
+        this._lastCoordinates[ model ] = end;
+
+        if( !start || start.length != end.length || steps <= 1 ){
+            this.updateCoordinates( end, model );
+            return;
+        }
+
+        // a newer frame stops the running interpolation
+        var id = ( this._interpolationIds[ model ] || 0 ) + 1;
+        this._interpolationIds[ model ] = id;
+        var current = new Float32Array( end.length );
+        var step = 1;
+
+        var tick = function(){
+            if( this._interpolationIds[ model ] !== id ){
+                return;
+            }
+            var t = step / steps;
+            for( var i = 0; i < end.length; i++ ){
+                current[ i ] = start[ i ] + ( end[ i ] - start[ i ] ) * t;
+            }
+            this.updateCoordinates( current, model );
+            step += 1;
+            if( step <= steps ){
+                window.requestAnimationFrame( tick );
+            }
+        }.bind( this );
+        tick();
+    },
+
     updateCoordinates: function( coordinates, model ) {
         // coordinates must be ArrayBuffer (use this.decode_base64)
         var component = this.stage.compList[ model ];
@@ -707,7 +805,13 @@ var NGLView = widgets.DOMWidgetView.extend({
                             if( args0.type == 'blob' ) {
                                 var blob; 
                                 if( args0.binary ){
-                                    var decoded_data = this.decode_base64( args0.data );
+                                    var decoded_data;
+                                    if( args0.data.bufferIndex !== undefined ){
+                                        // raw bytes sent as comm buffer
+                                        decoded_data = msg.buffers[ args0.data.bufferIndex ];
+                                    }else{
+                                        decoded_data = this.decode_base64( args0.data );
+                                    }
                                     blob = new Blob( [ decoded_data ], { type: "application/octet-binary" });
                                 }else{
                                     blob = new Blob( [ args0.data ], { type: "text/plain" } );
@@ -739,6 +843,9 @@ var NGLView = widgets.DOMWidgetView.extend({
                     break;
                 case 'Widget':
                     var func = this[ msg.methodName ];
+                    if( msg.buffers ){
+                        new_args.push( msg.buffers );
+                    }
                     func.apply( this, new_args );
                     break;
                 case 'Representation':
@@ -754,6 +861,11 @@ var NGLView = widgets.DOMWidgetView.extend({
                 default:
                     break;
             }
+        }else if( msg.type == 'call_batch' ){
+            // several call_method messages sent at once
+            for ( var i = 0; i < msg.data.length; i++ ){
+                this.on_msg( msg.data[ i ] );
+            }
         }else if( msg.type == 'base64_single' ){
             // TODO: remove time
             var time0 = Date.now();
@@ -778,9 +890,21 @@ var NGLView = widgets.DOMWidgetView.extend({
 
             for ( var i = 0; i < keys.length ; i++ ){
                 var traj_index = keys[ i ];
-                var coordinates = new Float32Array( msg.buffers[ i ].buffer );
+                var meta = coordinateMeta[ traj_index ];
+                var coordinates;
+                if( meta.scale ){
+                    // uint16, see player.quant16
+                    coordinates = this.dequantize(
+                        new Uint16Array( msg.buffers[ i ].buffer ), meta.scale, meta.offset );
+                }else{
+                    coordinates = new Float32Array( msg.buffers[ i ].buffer );
+                }
                 if( coordinates.byteLength > 0 ){
-                    this.updateCoordinates( coordinates, traj_index );
+                    if( msg.iparams ){
+                        this.interpolateCoordinates( coordinates, traj_index, msg.iparams );
+                    }else{
+                        this.updateCoordinates( coordinates, traj_index );
+                    }
                 }
             }
             var time1 = Date.now();
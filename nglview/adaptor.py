@@ -109,6 +109,7 @@ class SimpletrajTrajectory(Trajectory, Structure):
     >>> w = nv.NGLWidget(t)
     >>> w
     '''
+    _reads_from_disk = True
 
     def __init__(self, path, structure_path):
         try:
@@ -197,6 +198,8 @@ class PyTrajTrajectory(Trajectory, Structure):
         self.ext = "pdb"
         self.params = {}
         self.id = str(uuid.uuid4())
+        # pt.iterload reads frames from files on access, pt.load keeps them in memory
+        self._reads_from_disk = type(trajectory).__name__ == 'TrajectoryIterator'
 
     def get_coordinates(self, index):
         return self.trajectory[index].xyz
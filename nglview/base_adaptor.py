@@ -23,6 +23,9 @@ class Structure(object):
 class Trajectory(object):
     """abstract base class
     """
+    # True if frames are read from files and reading a frame changes nothing
+    # the user holds: NGLWidget then keeps recently read frames in memory
+    _reads_from_disk = False
 
     def __init__(self):
         self.id = str(uuid.uuid4())
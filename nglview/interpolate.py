@@ -1,8 +1,14 @@
+import numpy as np
 
 __all__ = ['linear']
 
-def lerp(a, b, t):
-    return (b - a) * t + a
+def lerp(a, b, t, out=None):
+    """(b - a) * t + a, written to `out` if given
+    """
+    out = np.subtract(b, a, out=out)
+    out *= t
+    out += a
+    return out
 
 def linear(index, t, traj, step=1):
     """
@@ -20,5 +26,6 @@ def linear(index, t, traj, step=1):
     c = traj.get_coordinates(index).copy()
     cp = traj.get_coordinates(min(index + step, traj.n_frames-1)).copy()
 
-    coords = lerp(cp, c, t)
+    # reuse the copy of c for the result
+    coords = lerp(cp, c, t, out=c)
     return coords
@@ -21,4 +21,4 @@ REPRESENTATION_NAME_PAIRS = [
         ('ball_and_stick', 'ball+stick'),
         ]
 
-REPRESENTATION_NAMES = list(sorted(set([name for pairs in REPRESENTATION_NAME_PAIRS for name in pairs])))
+REPRESENTATION_NAMES = sorted({name for pairs in REPRESENTATION_NAME_PAIRS for name in pairs})
@@ -30,6 +30,14 @@ class TrajectoryPlayer(DOMWidget):
     step = Int(0).tag(sync=True)
     sync_frame = Bool(True).tag(sync=True)
     interpolate = Bool(False).tag(sync=False)
+    # with interpolate, send the frames and let JS animate between them
+    # over iparams['steps'] render ticks
+    js_interpolate = Bool(False).tag(sync=False)
+    # send coordinates as uint16 instead of float32, see py_utils.quantize_uint16
+    quant16 = Bool(False).tag(sync=False)
+    # read the next frame in a background thread during playback, only for
+    # trajectories read from disk (see Trajectory._reads_from_disk)
+    prefetch = Bool(False).tag(sync=False)
     delay = Float(0.0).tag(sync=True)
     parameters = Dict().tag(sync=True)
     iparams = Dict().tag(sync=False)
@@ -64,6 +72,7 @@ class TrajectoryPlayer(DOMWidget):
     widget_accordion_repr_parameters = Any(None).tag(sync=False)
     widget_repr_parameters_dialog = Any(None).tag(sync=False)
     widget_repr_name = Any(None).tag(sync=False)
+    widget_repr_selection = Any(None).tag(sync=False)
     widget_component_dropdown = Any(None).tag(sync=False)
     widget_drag = Any(None).tag(sync=False)
 
@@ -436,6 +445,7 @@ class TrajectoryPlayer(DOMWidget):
             self.widget_repr_name._ngl_name = 'repr_name_text'
             repr_selection = Text(value=' ', description='selection')
             repr_selection._ngl_name = 'repr_selection'
+            self.widget_repr_selection = repr_selection
             repr_selection.width = self.widget_repr_name.width = default.DEFAULT_TEXT_WIDTH 
 
             max_n_components = max(self._view.n_components-1, 0)
@@ -1,33 +1,121 @@
 from __future__ import absolute_import
-from traitlets import Int, Dict, Any, observe, Bool
-from ipywidgets import Box, DOMWidget, interactive
-from ipywidgets import VBox
+from tornado.ioloop import IOLoop
+from traitlets import Int, Dict, Any, observe, Bool, Float
+from ipywidgets import Box, DOMWidget
+from ipywidgets import VBox, FloatSlider, IntSlider, Dropdown, Checkbox
 
 # local
 from .color import COLOR_SCHEMES
 from .utils import widget_utils, py_utils
 from .layout import _relayout_master
 
+_ASSEMBLY_LIST = ('default', 'AU', 'BU1', 'UNITCELL', 'SUPERCELL')
+_SURFACE_TYPES = ('vws', 'sas', 'ms', 'ses')
+_COLOR_SCHEMES = tuple(COLOR_SCHEMES)
+_SURFACE_DESCRIPTIONS = frozenset(['probe_radius', 'smooth', 'surface_type',
+                                   'box_size', 'cutoff'])
+
+# (widget class, NGL parameter name, keyword arguments with default value)
+_WIDGET_TEMPLATES = (
+    (FloatSlider, 'opacity',
+     dict(value=1., min=0., max=1., step=0.1,
+          continuous_update=False, description='opacity')),
+    (Dropdown, 'assembly',
+     dict(value='default', options=_ASSEMBLY_LIST, description='assembly')),
+    (Dropdown, 'colorScheme',
+     dict(value=" ", options=_COLOR_SCHEMES, description='color_scheme')),
+    (Checkbox, 'wireframe',
+     dict(value=False, description='wireframe')),
+    (FloatSlider, 'probeRadius',
+     dict(value=1.4, min=0., max=5., step=0.1,
+          continuous_update=False, description='probe_radius')),
+    (FloatSlider, 'isolevel',
+     dict(value=2., min=0., max=10., step=0.1,
+          continuous_update=False, description='isolevel')),
+    (IntSlider, 'smooth',
+     dict(value=2, min=0, max=10, step=1,
+          continuous_update=False, description='smooth')),
+    (Dropdown, 'surfaceType',
+     dict(value='ms', options=_SURFACE_TYPES, description='surface_type')),
+    (IntSlider, 'boxSize',
+     dict(value=10, min=0, max=100, step=2,
+          continuous_update=False, description='box_size')),
+    (FloatSlider, 'cutoff',
+     dict(value=0., min=0., max=100, step=0.1,
+          continuous_update=False, description='cutoff')),
+)
+
+def _get_widget_value(repr_dict, key, kwargs):
+    """value from NGL, or the template default if a Dropdown does not list it
+    (e.g. colorScheme 'chainname', assembly 'BU2')
+    """
+    value = repr_dict.get(key, kwargs['value'])
+    if 'options' in kwargs and value not in kwargs['options']:
+        return kwargs['value']
+    return value
+
+def _is_valid_value(kid, value):
+    options = getattr(kid, 'options', None)
+    return options is None or value in options
+
 class RepresentationControl(Box):
     parameters = Dict().tag(sync=False)
     name = Any().tag(sync=False)
     repr_index = Int().tag(sync=False)
     component_index = Int().tag(sync=False)
     _disable_update_parameters = Bool(False).tag(sync=False)
+    # seconds to wait for more widget changes before sending them to NGL
+    _update_delay = Float(0.05).tag(sync=False)
 
     def __init__(self, view, component_index, repr_index, name=None, *args, **kwargs):
         super(RepresentationControl, self).__init__(*args, **kwargs)
+        self._pending_parameters = {}
+        # (component_index, repr_index) the pending parameters belong to
+        self._pending_target = None
+        # (ioloop, timeout handle) of the scheduled `_flush_parameters`
+        self._update_timer = None
+        # id(kid) -> (description, camelized description, type)
+        self._kid_meta = {}
         self.component_index = component_index   
         self.repr_index = repr_index
         self._view = view
         self.children = self._make_widget().children
+        self._surface_kids = tuple(kid for kid in self.children
+                                   if self._kid_meta[id(kid)][2] == 'surface')
         # trigger
         self.name = name
 
     def _on_change_widget_value(self, change):
+        if self._disable_update_parameters:
+            return
         owner = change['owner']
-        new = change['new']
-        self.parameters = {py_utils._camelize(owner._ngl_description): new}
+        self._pending_parameters[self._kid_meta[id(owner)][1]] = change['new']
+        # the representation being edited now, not when the timer fires
+        self._pending_target = (self.component_index, self.repr_index)
+
+        # debounce: send all changes made within _update_delay in one call.
+        # run on the kernel's IOLoop, so messages keep their order
+        self._cancel_update_timer()
+        ioloop = IOLoop.current()
+        self._update_timer = (ioloop,
+                ioloop.call_later(self._update_delay, self._flush_parameters))
+
+    def _cancel_update_timer(self):
+        if self._update_timer is not None:
+            ioloop, timeout = self._update_timer
+            ioloop.remove_timeout(timeout)
+            self._update_timer = None
+
+    def _flush_parameters(self):
+        """send pending widget changes now
+        """
+        self._cancel_update_timer()
+        parameters, self._pending_parameters = self._pending_parameters, {}
+        if parameters:
+            component_index, repr_index = self._pending_target
+            self._view.update_representation(component=component_index,
+                    repr_index=repr_index,
+                    **parameters)
 
     @observe('parameters')
     def _on_parameters_changed(self, change):
@@ -40,37 +128,34 @@ class RepresentationControl(Box):
 
     @observe('name')
     def _on_name_changed(self, change):
-        new_name = change['new']
-        if new_name == 'surface':
-            for kid in self.children:
-                if kid._ngl_type == 'surface':
-                    kid.layout.display = 'flex'
-        else:
-            for kid in self.children:
-                if kid._ngl_type == 'surface':
-                    kid.layout.display = 'none'
+        display = 'flex' if change['new'] == 'surface' else 'none'
+        for kid in self._surface_kids:
+            kid.layout.display = display
 
     def _get_name_and_repr_dict(self, c_string, r_string):
-        try:
-            _repr_dict = self._view._repr_dict[c_string][r_string]['parameters']
-            name = self._view._repr_dict[c_string][r_string]['name']
-        except KeyError:
-            _repr_dict = dict()
-            name = ''
+        d = self._view._repr_dict.get(c_string, {}).get(r_string)
+        if d is None:
+            return '', {}
+        return d.get('name', ''), d.get('parameters', {})
 
-        return name, _repr_dict
+    @observe('component_index')
+    def _on_component_index_changed(self, change):
+        # pending changes belong to the previous component
+        self._flush_parameters()
 
     @observe('repr_index')
     def _on_repr_index_changed(self, change):
+        # pending changes belong to the previous representation
+        self._flush_parameters()
         c_string = 'c' + str(self.component_index)
         r_string = str(change['new'])
         name, _repr_dict = self._get_name_and_repr_dict(c_string, r_string)
         self.name = name
         self._disable_update_parameters = True
         for kid in self.children:
-            desc = py_utils._camelize(kid._ngl_description)
-            if desc in _repr_dict:
-                kid.value = _repr_dict.get(desc)
+            value = _repr_dict.get(self._kid_meta[id(kid)][1])
+            if value is not None and _is_valid_value(kid, value):
+                kid.value = value
         self._disable_update_parameters = False
 
     def _make_widget(self):
@@ -78,36 +163,19 @@ class RepresentationControl(Box):
         r_string = str(self.repr_index)
         name, _repr_dict = self._get_name_and_repr_dict(c_string, r_string)
 
-        assembly_list = ['default', 'AU', 'BU1', 'UNITCELL', 'SUPERCELL']
-        surface_types = ['vws', 'sas', 'ms', 'ses']
-
-        def func(opacity=_repr_dict.get('opacity', 1.),
-                 assembly=_repr_dict.get('assembly', 'default'),
-                 color_scheme=_repr_dict.get('colorScheme', " "),
-                 wireframe=_repr_dict.get('wireframe', False),
-                 probe_radius=_repr_dict.get('probeRadius', 1.4),
-                 isolevel=_repr_dict.get('isolevel', 2.),
-                 smooth=_repr_dict.get('smooth', 2.),
-                 surface_type=_repr_dict.get('surfaceType', 'ms'),
-                 box_size=_repr_dict.get('boxSize', 10),
-                 cutoff=_repr_dict.get('cutoff', 0)):
-            pass
-
-        widget = interactive(func, opacity=(0., 1., 0.1),
-                                 color_scheme=COLOR_SCHEMES,
-                                 assembly=assembly_list,
-                                 probe_radius=(0., 5., 0.1),
-                                 isolevel=(0., 10., 0.1),
-                                 smooth=(0, 10, 1),
-                                 surface_type=surface_types,
-                                 box_size=(0, 100, 2),
-                                 cutoff=(0., 100, 0.1),
-                                 continuous_update=False)
+        kids = [cls(**dict(kwargs, value=_get_widget_value(_repr_dict, key, kwargs)))
+                for cls, key, kwargs in _WIDGET_TEMPLATES]
+        widget = VBox(kids)
+
+        self._kid_meta = {}
         for kid in widget.children:
-            setattr(kid, '_ngl_description', kid.description)
-            if kid._ngl_description in ['probe_radius', 'smooth', 'surface_type', 'box_size', 'cutoff']:
-                setattr(kid, '_ngl_type', 'surface')
+            description = kid.description
+            if description in _SURFACE_DESCRIPTIONS:
+                ngl_type = 'surface'
             else:
-                setattr(kid, '_ngl_type', 'basic')
+                ngl_type = 'basic'
+            self._kid_meta[id(kid)] = (description,
+                                       py_utils._camelize(description),
+                                       ngl_type)
             kid.observe(self._on_change_widget_value, 'value')
         return widget
@@ -5,7 +5,9 @@ import nglview
 from nglview.utils import py_utils, js_utils
 from nglview.utils.py_utils import seq_to_string, _camelize, _camelize_dict, FileManager
 import nose.tools as nt
+import pytest
 import gzip
+import numpy as np
 
 # local
 from utils import get_fn
@@ -19,6 +21,45 @@ def test_get_name():
 def test_seq_to_string():
     nt.assert_equal(seq_to_string([1, 2, 3]), '@1,2,3')
     nt.assert_equal(seq_to_string('@1,2,3'), '@1,2,3')
+    nt.assert_equal(seq_to_string(np.array([1, 2, 3])), '@1,2,3')
+
+def test_quantize_uint16():
+    xyz = np.array([[0., 1., 5.], [10., -2., 5.], [3.3, 4.4, 5.]])
+    quantized, scale, offset = py_utils.quantize_uint16(xyz)
+    nt.assert_equal(quantized.dtype, np.dtype('u2'))
+    np.testing.assert_allclose(quantized * scale + offset, xyz, atol=1E-3)
+    # range too large for 0.01 precision
+    nt.assert_true(py_utils.quantize_uint16(xyz * 1000) is None)
+
+def test_get_colors_from_b64():
+    Image = pytest.importorskip('PIL.Image')
+    import base64
+    import io
+
+    def to_b64(image):
+        fp = io.BytesIO()
+        image.save(fp, format='PNG')
+        return base64.b64encode(fp.getvalue())
+
+    rng = np.random.RandomState(42)
+    palette = rng.randint(0, 256, size=(5, 4)).astype('u1')
+    pixels = palette[rng.randint(0, 5, size=(20, 30))]
+
+    for mode, arr in [('RGB', pixels[..., :3]),
+                      ('RGBA', pixels),
+                      ('L', pixels[..., 0])]:
+        image = Image.fromarray(np.ascontiguousarray(arr))
+        nt.assert_equal(image.mode, mode)
+        b64 = to_b64(image)
+        # same result as PIL
+        nt.assert_equal(sorted(py_utils.get_colors_from_b64(b64)),
+                        sorted(image.getcolors(int(1E6))))
+
+    # keep only the 4 high bits of each band
+    image = Image.fromarray(np.ascontiguousarray(pixels[..., :3]))
+    expected = Image.fromarray(pixels[..., :3] & 0xF0).getcolors(int(1E6))
+    nt.assert_equal(sorted(py_utils.get_colors_from_b64(to_b64(image), bits=4)),
+                    sorted(expected))
 
 def test_camelize():
     nt.assert_equal(_camelize('remote_call'), 'remoteCall')
@@ -132,6 +173,39 @@ def test_file_gz():
     content = gzip.open(src).read() 
     nt.assert_equal(fh4.read(force_buffer=True), content)
 
+def test_file_gz_bz2_zip():
+    import bz2
+    import shutil
+    import tempfile
+    from zipfile import ZipFile
+
+    src = get_fn('tz2.pdb')
+    content = open(src, 'rb').read()
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        fn = os.path.join(tempdir, 'tz2.pdb.gz')
+        with gzip.open(fn, 'wb') as fh:
+            fh.write(content)
+        fn = os.path.join(tempdir, 'tz2.pdb.bz2')
+        with bz2.BZ2File(fn, 'wb') as fh:
+            fh.write(content)
+        fn = os.path.join(tempdir, 'tz2.pdb.zip')
+        with ZipFile(fn, 'w') as fh:
+            fh.write(src, 'tz2.pdb')
+
+        for ext in ['gz', 'bz2', 'zip']:
+            fm = FileManager(os.path.join(tempdir, 'tz2.pdb.' + ext))
+            nt.assert_true(fm.is_compressed)
+            nt.assert_equal(fm.compressed_ext, ext)
+            nt.assert_equal(fm.ext, 'pdb')
+            nt.assert_equal(fm.read(force_buffer=True), content)
+            chunks = list(fm.read_chunks(chunk_size=1000))
+            nt.assert_true(len(chunks) > 1)
+            nt.assert_equal(b''.join(chunks), content)
+    finally:
+        shutil.rmtree(tempdir)
+
 def test_file_passing_blob():
     src = get_fn('tz2.pdb')
     blob = open(src).read()
@@ -160,6 +234,12 @@ def test_get_repr_names_from_dict():
     nt.assert_equal(py_utils.get_repr_names_from_dict(fake_repr_dict, 1),
                     ['base'])
 
+    # new dict
+    fake_repr_dict = dict(c0={'0': {'name': 'surface'}})
+    nt.assert_equal(py_utils.get_repr_names_from_dict(fake_repr_dict, 0),
+                    ['surface'])
+    nt.assert_equal(py_utils.get_repr_names_from_dict(fake_repr_dict, 1), [])
+
 def test_js_utils():
     js_utils.launch_qtconsole()
     js_utils.clean_empty_output_area()
@@ -21,25 +21,47 @@ import ipywidgets as widgets
 from traitlets import TraitError, link
 from IPython import display
 
-import pytraj as pt
 import nglview as nv
 from nglview import NGLWidget
 from nglview import widget_utils
-import mdtraj as md
-import parmed as pmd
 from nglview.utils.py_utils import PY2, PY3
 from nglview import js_utils
 from nglview.representation import RepresentationControl
-from nglview.utils.py_utils import encode_base64, decode_base64
+from nglview.utils.py_utils import encode_base64, encode_base64_raw, decode_base64
 from nglview import interpolate
 
 # local
 from utils import get_fn, repr_dict as REPR_DICT
 
 def default_view():
+    pt = pytest.importorskip('pytraj')
     traj = pt.load(nv.datafiles.TRR, nv.datafiles.PDB)
     return nv.show_pytraj(traj)
 
+class InMemoryTrajectory(nv.Structure, nv.Trajectory):
+    """pytraj-free trajectory for testing
+    """
+    def __init__(self, xyz):
+        nv.Structure.__init__(self)
+        nv.Trajectory.__init__(self)
+        self.xyz = xyz
+
+    def get_structure_string(self):
+        return open(get_fn('tz2.pdb')).read()
+
+    def get_coordinates(self, index):
+        return self.xyz[index]
+
+    @property
+    def n_frames(self):
+        return len(self.xyz)
+
+def in_memory_view(n_frames=4):
+    xyz = np.arange(n_frames * 3 * 3, dtype='f4').reshape(n_frames, 3, 3)
+    view = NGLWidget()
+    view.add_trajectory(InMemoryTrajectory(xyz))
+    return view
+
 #-----------------------------------------------------------------------------
 # Utility stuff from ipywidgets tests
 #-----------------------------------------------------------------------------
@@ -87,11 +109,10 @@ DEFAULT_REPR = [{'params': {'sele': 'polymer'}, 'type': 'cartoon'},
 
 def _assert_dict_list_equal(listdict0, listdict1):
     for (dict0, dict1) in zip(listdict0, listdict1):
-        for (key0, key1) in zip(sorted(dict0.keys()), sorted(dict1.keys())):
-            nt.assert_equal(key0, key1)
-            nt.assert_equal(dict0.get(key0), dict1.get(key1))
+        nt.assert_equal(dict0, dict1)
 
 def test_API_promise_to_have():
+    pt = pytest.importorskip('pytraj')
     view = nv.demo()
 
     # Structure
@@ -115,6 +136,7 @@ def test_API_promise_to_have():
     # add component
     view.add_component('rcsb://1tsu.pdb')
     view.add_pdbid('1tsu')
+    view.add_pdbid('1tsu', ext='cif')
 
     # display
     js_utils.clean_error_output()
@@ -217,6 +239,7 @@ def test_base_adaptor():
     pytest.raises(NotImplementedError, func_1)
 
 def test_coordinates_dict():
+    pt = pytest.importorskip('pytraj')
     traj = pt.load(nv.datafiles.TRR, nv.datafiles.PDB)
     view = nv.show_pytraj(traj)
     view.frame = 1
@@ -227,7 +250,99 @@ def test_coordinates_dict():
     view._send_binary = False
     view.coordinates_dict = {0: coords}
 
+def test_coordinates_cache():
+    view = in_memory_view(n_frames=5)
+    view._coordinates_cache_size = 2
+    trajectory = view._trajlist[0]
+
+    # in-memory frames are not cached, they can be edited in place
+    view._get_coordinates(trajectory, 1)
+    nt.assert_equal(len(view._coordinates_cache), 0)
+
+    trajectory._reads_from_disk = True
+    coords = view._get_coordinates(trajectory, 1)
+    view._get_coordinates(trajectory, 2)
+    # reuse cached frame
+    nt.assert_true(view._get_coordinates(trajectory, 1) is coords)
+    view._get_coordinates(trajectory, 3)
+    nt.assert_equal(len(view._coordinates_cache), 2)
+    nt.assert_false((trajectory.id, 2) in view._coordinates_cache)
+    aa_eq(view._get_coordinates(trajectory, 3), trajectory.xyz[3])
+
+    # _refresh_render reads the frame again
+    view.displayed = True
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append(buffers)
+    view.frame = 3
+    trajectory.xyz = trajectory.xyz + 1
+    view._refresh_render()
+    aa_eq(np.frombuffer(sent[-1][0], dtype='f4').reshape(-1, 3), trajectory.xyz[3])
+
+    # prefetch next frame, only if asked
+    view._clear_coordinates_cache()
+    view.frame = 0
+    nt.assert_true(view._prefetch_thread is None)
+    view.player.prefetch = True
+    view.frame = 1
+    view._prefetch_thread.join()
+    nt.assert_true((trajectory.id, 2) in view._coordinates_cache)
+
+    # not for in-memory trajectories
+    trajectory._reads_from_disk = False
+    view._prefetch_thread = None
+    view.frame = 2
+    nt.assert_true(view._prefetch_thread is None)
+
+def test_coordinates_message_order():
+    view = in_memory_view()
+    view.displayed = True
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append(msg)
+    view.frame = 1
+    view.frame = 2
+    view._remote_call('makeImage', target='Widget')
+    # coordinates are sent right away, before any later message
+    nt.assert_equal([msg.get('methodName', msg['type']) for msg in sent],
+                    ['binary_single', 'binary_single', 'makeImage'])
+    aa_eq(view.coordinates_dict[0], view._trajlist[0].xyz[2])
+
+    # frame changes do not hash the coordinates
+    nt.assert_true(view._coordinates_sent_signature is None)
+
+    # same coordinates assigned again
+    coordinates = {0: view._trajlist[0].xyz[3]}
+    view.coordinates_dict = coordinates
+    nt.assert_equal(len(sent), 4)
+    view.coordinates_dict = dict(coordinates)
+    nt.assert_equal(len(sent), 4)
+
+def test_coordinates_many_trajectories():
+    trajs = [InMemoryTrajectory(np.random.rand(3, n_atoms, 3))
+             for n_atoms in (5, 7) * 3]
+    view = NGLWidget()
+    for traj in trajs:
+        view.add_trajectory(traj)
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append((msg, buffers))
+    view.frame = 1
+    msg, buffers = sent[-1]
+    nt.assert_equal(sorted(msg['data']), list(range(len(trajs))))
+    for traj, buf in zip(trajs, buffers):
+        aa_eq(np.frombuffer(buf, dtype='f4').reshape(-1, 3), traj.xyz[1], decimal=4)
+    # same result when the float64 arrays are cast in the thread pool
+    from nglview import widget as widget_module
+    min_bytes = widget_module._PARALLEL_PACK_MIN_BYTES
+    widget_module._PARALLEL_PACK_MIN_BYTES = 0
+    try:
+        view.frame = 2
+    finally:
+        widget_module._PARALLEL_PACK_MIN_BYTES = min_bytes
+    msg, buffers = sent[-1]
+    for traj, buf in zip(trajs, buffers):
+        aa_eq(np.frombuffer(buf, dtype='f4').reshape(-1, 3), traj.xyz[2], decimal=4)
+
 def test_load_data():
+    pt = pytest.importorskip('pytraj')
     view = nv.show_pytraj(pt.datafiles.load_tz2())
 
     # load blob with ext
@@ -244,7 +359,33 @@ def test_load_data():
     # load current folder
     view._load_data(get_fn('tz2.pdb'))
 
+def test_load_data_buffers():
+    # binary blob is sent as comm buffer
+    view = NGLWidget()
+    view.displayed = True
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append((msg, buffers))
+    binary_blob = b'\x00\x01\x02'
+    view._load_data(binary_blob, ext='mmtf')
+    msg, buffers = sent[-1]
+    nt.assert_equal(msg['args'][0]['data'], {'bufferIndex': 0})
+    nt.assert_equal(buffers, [binary_blob])
+
+    # large file is sent in chunks
+    sent[:] = []
+    fn = nv.datafiles.PDB
+    content = open(fn, 'rb').read()
+    view._load_data(fn, stream=True)
+    nt.assert_equal([msg['methodName'] for msg, _ in sent[:-1]],
+                    ['appendChunk'] * (len(sent) - 1))
+    nt.assert_equal(b''.join(buffers[0] for _, buffers in sent[:-1]), content)
+    msg, buffers = sent[-1]
+    nt.assert_equal(msg['methodName'], 'loadStream')
+    nt.assert_equal(msg['args'][0], sent[0][0]['args'][0])
+    nt.assert_equal(msg['kwargs']['ext'], 'pdb')
+
 def test_representations():
+    pt = pytest.importorskip('pytraj')
     view = nv.show_pytraj(pt.datafiles.load_tz2())
     nt.assert_equal(view.representations, DEFAULT_REPR)
     view.add_cartoon()
@@ -267,11 +408,77 @@ def test_representations():
     representation_widget
     representation_widget._on_parameters_changed(change=dict(new=dict()))
 
+def test_repr_names_cache():
+    view = NGLWidget()
+    view._repr_dict = REPR_DICT
+    names = view._get_repr_names(0)
+    nt.assert_equal(names, [REPR_DICT['c0'][key]['name']
+                            for key in sorted(REPR_DICT['c0'])])
+    # callers can not change the cache
+    names.append('surface')
+    nt.assert_equal(len(view._get_repr_names(0)), len(REPR_DICT['c0']))
+    # other widgets have their own cache
+    nt.assert_equal(NGLWidget()._get_repr_names(0), [])
+    # new info from NGL resets the cache
+    view._repr_dict = {'c0': {'0': {'name': 'surface'}}}
+    nt.assert_equal(view._get_repr_names(0), ['surface'])
+
+def test_representation_control_unknown_option():
+    import copy
+    view = NGLWidget()
+    repr_dict = copy.deepcopy(REPR_DICT)
+    for index in ('0', '1'):
+        repr_dict['c0'][index]['parameters'].update(colorScheme='chainname',
+                                                    assembly='BU2')
+    view._repr_dict = repr_dict
+    repr_control = RepresentationControl(view, 0, 0)
+    kids = dict((kid.description, kid) for kid in repr_control.children)
+    nt.assert_equal(kids['color_scheme'].value, " ")
+    nt.assert_equal(kids['assembly'].value, 'default')
+    repr_control.repr_index = 1
+    nt.assert_equal(kids['color_scheme'].value, " ")
+
+def test_representation_control_debounce():
+    view = NGLWidget()
+    view._repr_dict = REPR_DICT
+    calls = []
+    view.update_representation = lambda **kwargs: calls.append(kwargs)
+    repr_control = RepresentationControl(view, 0, 0)
+    opacity = repr_control.children[0]
+    nt.assert_equal(opacity.description, 'opacity')
+
+    # changes within _update_delay are sent in one call
+    repr_control._update_delay = 10.
+    opacity.value = 0.3
+    repr_control.children[3].value = True
+    nt.assert_equal(calls, [])
+    repr_control._flush_parameters()
+    nt.assert_equal(calls, [dict(component=0, repr_index=0,
+                                 opacity=0.3, wireframe=True)])
+
+    # switching representation sends pending changes to the edited one
+    calls[:] = []
+    opacity.value = 0.5
+    repr_control.repr_index = 1
+    nt.assert_equal(calls, [dict(component=0, repr_index=0, opacity=0.5)])
+
+    # timer, fired by the IOLoop
+    from tornado import gen
+    from tornado.ioloop import IOLoop
+    calls[:] = []
+    repr_control._update_delay = 0.05
+    opacity.value = 0.7
+    nt.assert_equal(calls, [])
+    IOLoop.current().run_sync(lambda: gen.sleep(0.2))
+    nt.assert_equal(calls, [dict(component=0, repr_index=1, opacity=0.7)])
+    nt.assert_true(repr_control._update_timer is None)
+
 def test_representation_control():
     view = nv.demo()
     repr_control = view._display_repr()
                     
 def test_add_repr_shortcut():
+    pt = pytest.importorskip('pytraj')
     view = nv.show_pytraj(pt.datafiles.load_tz2())
     assert isinstance(view, nv.NGLWidget), 'must be instance of NGLWidget'
 
@@ -298,6 +505,7 @@ def test_add_new_shape():
 
 def test_remote_call():
     # how to test JS?
+    pt = pytest.importorskip('pytraj')
     view = nv.show_pytraj(pt.datafiles.load_tz2())
     view._remote_call('centerView', target='stage')
 
@@ -305,9 +513,61 @@ def test_remote_call():
     kwargs = {'defaultRepresentation': True}
     view._remote_call('loadFile', target='stage', args=[fn,], kwargs=kwargs)
 
+def test_remote_call_batch():
+    view = in_memory_view()
+
+    # one message for all representations
+    n_callbacks = len(view._ngl_displayed_callbacks)
+    reps = [{'type': 'cartoon', 'params': {'sele': 'protein'}},
+            {'type': 'licorice', 'params': {'sele': 'all'}}]
+    view.set_representations(reps)
+    nt.assert_equal(len(view._ngl_displayed_callbacks), n_callbacks + 1)
+    nt.assert_equal(view._ngl_displayed_callbacks[-1]._method_name, 'call_batch')
+    # do not modify input
+    nt.assert_equal(reps[0]['params'], {'sele': 'protein'})
+
+    # one message for a loop over components
+    n_callbacks = len(view._ngl_displayed_callbacks)
+    view.add_trajectory(InMemoryTrajectory(view._trajlist[0].xyz))
+    view.hide([0, 1])
+    view.show_only([1])
+    nt.assert_equal(len(view._ngl_displayed_callbacks), n_callbacks + 2)
+
+    # no message if visibility does not change
+    n_callbacks = len(view._ngl_displayed_callbacks)
+    view.show_only([1])
+    view.hide([0])
+    view[1].show()
+    nt.assert_equal(len(view._ngl_displayed_callbacks), n_callbacks)
+    view[0].show()
+    nt.assert_equal(len(view._ngl_displayed_callbacks), n_callbacks + 1)
+    view.show_only([0, 1])
+    nt.assert_equal(len(view._ngl_displayed_callbacks), n_callbacks + 1)
+
+    # send right away once displayed
+    n_callbacks = len(view._ngl_displayed_callbacks)
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append(msg)
+    view.displayed = True
+    view._remote_call('centerView', target='Stage')
+    nt.assert_equal(len(view._ngl_displayed_callbacks), n_callbacks)
+    nt.assert_equal(sent[-1]['methodName'], 'centerView')
+
+    # a call with buffers does not jump ahead of the calls collected before it
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append(msg)
+    with view._batched():
+        view._remote_call('centerView', target='Stage')
+        view._load_data(b'\x00\x01\x02', ext='mmtf')
+        view._remote_call('autoView', target='Stage')
+    nt.assert_equal([msg['type'] for msg in sent],
+                    ['call_batch', 'call_method', 'call_batch'])
+    nt.assert_equal(sent[1]['methodName'], 'loadFile')
+
 def test_download_image():
     """just make sure it can be called
     """
+    pt = pytest.importorskip('pytraj')
     view = nv.show_pytraj(pt.datafiles.load_tz2())
     view.download_image('myname.png', 2, False, False, True)
 
@@ -325,23 +585,31 @@ def test_show_simpletraj():
     view.frame = 3
 
 def test_show_mdtraj():
-    import mdtraj as md
+    md = pytest.importorskip('mdtraj')
     from mdtraj.testing import get_fn
     fn = nv.datafiles.PDB 
     traj = md.load(fn)
     view = nv.show_mdtraj(traj)
 
+    # in-place changes (e.g. superpose) are shown
+    ngl_traj = view._trajlist[0]
+    aa_eq(ngl_traj.get_coordinates(0), 10 * traj.xyz[0])
+    traj.xyz += 1
+    aa_eq(ngl_traj.get_coordinates(0), 10 * traj.xyz[0])
+
 def test_show_MDAnalysis():
-    from MDAnalysis import Universe
+    Universe = pytest.importorskip('MDAnalysis').Universe
     tn, fn = nv.datafiles.PDB, nv.datafiles.PDB
     u = Universe(fn, tn)
     view = nv.show_mdanalysis(u)
 
 def test_show_parmed():
-    import parmed as pmd
+    pmd = pytest.importorskip('parmed')
     fn = nv.datafiles.PDB 
     parm = pmd.load_file(fn)
     view = nv.show_parmed(parm)
+    aa_eq(view[0].get_coordinates(0), parm.get_coordinates()[0])
+    nt.assert_equal(view[0].get_coordinates(0).dtype, parm.get_coordinates().dtype)
 
     ngl_traj = nv.ParmEdTrajectory(parm)
     ngl_traj.only_save_1st_model = False
@@ -355,14 +623,30 @@ def test_encode_and_decode():
     new_xyz = decode_base64(b64_str, dtype='f4', shape=shape)
     aa_eq(xyz, new_xyz) 
 
+    # non-contiguous, different dtype
+    xyz = np.arange(300).reshape(100, 3).astype('f8')[::2]
+    b64_str = encode_base64(xyz)
+    new_xyz = decode_base64(b64_str, dtype='f4', shape=xyz.shape)
+    aa_eq(xyz, new_xyz)
+    aa_eq(xyz, decode_base64(b64_str, dtype='f4', shape=(-1, 3)))
+    # payload does not match the shape
+    with pytest.raises(ValueError):
+        decode_base64(b64_str, dtype='f4', shape=(10, 3))
+
+    # bytes
+    nt.assert_equal(encode_base64_raw(xyz), b64_str.encode('ascii'))
+
 def test_coordinates_meta():
+    pt = pytest.importorskip('pytraj')
+    md = pytest.importorskip('mdtraj')
+    pmd = pytest.importorskip('parmed')
     from mdtraj.testing import get_fn
     fn, tn = [get_fn('frame0.pdb'),] * 2
     trajs = [pt.load(fn, tn), md.load(fn, top=tn), pmd.load_file(tn, fn)]
 
     N_FRAMES = trajs[0].n_frames
 
-    from MDAnalysis import Universe
+    Universe = pytest.importorskip('MDAnalysis').Universe
     u = Universe(tn, fn)
     trajs.append(Universe(tn, fn))
 
@@ -386,12 +670,36 @@ def test_structure_file():
     content = gzip.open(fn).read()
     nt.assert_equal(content, fs2.get_structure_string()) 
 
+def test_component_viewer_negative_index():
+    view = in_memory_view()
+    last = view[-1]
+    nt.assert_true(last is view[0])
+    traj = InMemoryTrajectory(np.ones((2, 3, 3), dtype='f4'))
+    view.add_trajectory(traj)
+    nt.assert_equal(view[-1]._index, 1)
+    nt.assert_equal(view[-1].id, traj.id)
+    aa_eq(view[-1].get_coordinates(1), traj.xyz[1])
+    nt.assert_raises(AssertionError, lambda: view[-3])
+
+def test_component_viewer_trajectory_attributes():
+    view = in_memory_view(n_frames=4)
+    traj = view._trajlist[0]
+    comp = view[0]
+    nt.assert_equal(comp.n_frames, 4)
+    nt.assert_true('n_frames' in dir(comp))
+    # cached viewer sees the current trajectory, not a snapshot
+    traj.xyz = np.concatenate([traj.xyz, traj.xyz])
+    nt.assert_true(view[0] is comp)
+    nt.assert_equal(comp.n_frames, 8)
+    nt.assert_raises(AttributeError, lambda: comp.not_an_attribute)
+
 def test_camelize_parameters():
     view = nv.NGLWidget()
     view.parameters = dict(background_color='black')
     nt.assert_true('backgroundColor' in view._parameters) 
 
 def test_component_for_duck_typing():
+    pt = pytest.importorskip('pytraj')
     view = NGLWidget()
     traj = pt.load(nv.datafiles.PDB)
     view.add_component(get_fn('tz2.pdb'))
@@ -401,6 +709,7 @@ def test_component_for_duck_typing():
     
     c0 = view[0]
     c1 = view[1]
+    nt.assert_false(hasattr(c0, '__dict__'))
     nt.assert_true(hasattr(view, 'component_0'))
     nt.assert_true(hasattr(view, 'component_1'))
     nt.assert_true(hasattr(view, 'trajectory_0'))
@@ -414,7 +723,23 @@ def test_component_for_duck_typing():
     view.remove_component(c0.id)
     nt.assert_false(hasattr(view, 'component_2'))
 
+    # made on demand
+    nt.assert_true('component_1' in dir(view))
+    nt.assert_true('trajectory_0' in dir(view))
+    nt.assert_equal(view.trajectory_0.id, view._trajlist[0].id)
+    nt.assert_equal(view.component_1._index, 1)
+
+    nt.assert_equal(view._component_indices,
+                    dict((cid, i) for i, cid in enumerate(view._ngl_component_ids)))
+
+    # ComponentViewer is reused until a component is removed
+    nt.assert_true(view[0] is view.component_0)
+    c0 = view[0]
+    view.remove_component(c0.id)
+    nt.assert_false(view[0] is c0)
+
 def test_trajectory_show_hide_sending_cooridnates():
+    pt = pytest.importorskip('pytraj')
     view = NGLWidget()
 
     traj0 = pt.datafiles.load_tz2()
@@ -494,6 +819,7 @@ def test_existing_js_files():
     nt.assert_equal(len(mapfiles), 1)
 
 def test_add_struture_then_trajectory():
+    pt = pytest.importorskip('pytraj')
     view = nv.show_structure_file(get_fn('tz2.pdb'))
     view.loaded = True
     traj = pt.datafiles.load_trpcage()
@@ -504,7 +830,35 @@ def test_add_struture_then_trajectory():
     view.loaded = False
     view.add_trajectory(traj)
 
+def test_bulk_add():
+    traj = InMemoryTrajectory(np.zeros((5, 3, 3), dtype='f4'))
+    view = nv.NGLWidget()
+    view.loaded = True
+    n_callbacks = len(view._ngl_displayed_callbacks)
+    with view.bulk_add():
+        view.add_structure(nv.FileStructure(get_fn('tz2.pdb')))
+        view.add_trajectory(traj)
+        view.add_structure(nv.FileStructure(get_fn('tz2.pdb')))
+        nt.assert_equal(view.count, 1)
+    # a single message for all loadFile and centerView calls
+    nt.assert_equal(len(view._ngl_displayed_callbacks), n_callbacks + 1)
+    nt.assert_equal(view._ngl_displayed_callbacks[-1]._method_name, 'call_batch')
+    nt.assert_equal(view.count, traj.n_frames)
+    nt.assert_equal(len(view._ngl_component_ids), 3)
+
+    # components are loaded in the order they are added
+    view.displayed = True
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append(msg)
+    with view.bulk_add():
+        view.add_component(get_fn('tz2.pdb'))
+        view.add_component(b'\x00\x01\x02', ext='mmtf')
+    nt.assert_equal([msg['type'] for msg in sent], ['call_batch', 'call_method'])
+    nt.assert_equal(sent[0]['data'][0]['methodName'], 'loadFile')
+    nt.assert_equal(sent[1]['methodName'], 'loadFile')
+
 def test_player_simple():
+    pt = pytest.importorskip('pytraj')
     traj = pt.datafiles.load_tz2()
     view = nv.show_pytraj(traj)
     nt.assert_false(view.player.sync_frame)
@@ -561,6 +915,7 @@ def test_player_simple():
     player._create_all_widgets()
 
 def test_player_link_to_ipywidgets():
+    pt = pytest.importorskip('pytraj')
     traj = pt.datafiles.load_tz2()
     view = nv.show_pytraj(traj)
 
@@ -594,10 +949,26 @@ def test_player_interpolation():
 
     nt.assert_raises(ValueError, func())
 
+def test_player_js_interpolation():
+    view = in_memory_view()
+    sent = []
+    view.send = lambda msg, buffers=None: sent.append((msg, buffers))
+    view.player.interpolate = True
+    view.player.js_interpolate = True
+    view.frame = 2
+    # send the frame itself, JS interpolates from the previous one
+    msg, buffers = sent[-1]
+    nt.assert_equal(msg['iparams']['type'], 'linear')
+    aa_eq(np.frombuffer(buffers[0], dtype='f4').reshape(-1, 3),
+          view._trajlist[0].get_coordinates(2), decimal=4)
+
 def test_player_picked():
     view = nv.demo()
     s = dict(x=3)
+    # no Picked text box yet
+    view.picked = dict(x=2)
     view.player.widget_picked = view.player._make_text_picked()
+    nt.assert_equal(view.player.widget_picked.value, '{"x": 2}')
     view.picked = s
     nt.assert_equal(view.player.widget_picked.value, '{"x": 3}')
 
@@ -638,9 +1009,11 @@ def test_player_click_tab():
 
 def test_interpolate():
     # dummy test
+    pt = pytest.importorskip('pytraj')
     traj = pt.datafiles.load_tz2()
     ngl_traj = nv.PyTrajTrajectory(traj)
-    interpolate.linear(0, 0.4, ngl_traj, step=1)
+    coords = interpolate.linear(0, 0.4, ngl_traj, step=1)
+    aa_eq(coords, (traj[0].xyz - traj[1].xyz) * 0.4 + traj[1].xyz)
 
 def dummy_test_to_increase_coverage():
     nv.__version__
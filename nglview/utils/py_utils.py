@@ -1,20 +1,32 @@
 from __future__ import absolute_import
 import os
 import sys
+import io
 import gzip
 import bz2
 from zipfile import ZipFile
-import base64
+import numpy as np
 
-__all__ = ['encode_base64', 'decode_base64',
-           'seq_to_string', '_camelize',
+try:
+    # SIMD accelerated, drop-in replacement of the standard library module
+    import pybase64 as base64
+except ImportError:
+    # binascii's C loop; a NumPy lookup-table encoder was measured ~4x slower
+    import base64
+
+from ..default import NGL_BASE_URL
+
+# PIL is optional, imported on first use by get_colors_from_b64
+_Image = None
+
+__all__ = ['encode_base64', 'encode_base64_raw', 'decode_base64',
+           'quantize_uint16', 'seq_to_string', '_camelize',
            '_camelize_dict', 'get_colors_from_b64']
 
 PY2 = sys.version_info[0] == 2
 PY3 = sys.version_info[0] == 3
 
 def _update_url(func):
-    from nglview.default import NGL_BASE_URL
     func.__doc__ = func.__doc__.format(ngl_url=NGL_BASE_URL)
     return func
 
@@ -24,14 +36,46 @@ else:
     string_types = basestring
 
 def encode_base64(arr, dtype='f4'):
-    arr = arr.astype(dtype)
-    return base64.b64encode(arr.data).decode('utf8')
+    return encode_base64_raw(arr, dtype=dtype).decode('ascii')
+
+def encode_base64_raw(arr, dtype='f4'):
+    """same as `encode_base64` but return ascii bytes, for callers that
+    can consume bytes directly
+    """
+    # no copy if arr is already C-contiguous with the requested dtype
+    arr = np.ascontiguousarray(arr, dtype=dtype)
+    return base64.b64encode(arr.data)
 
 def decode_base64(data, shape, dtype='f4'):
-    import numpy as np
     decoded_str = base64.b64decode(data)
+    # frombuffer is a view, no copy; reshape supports -1 and rejects a wrong size
     return np.frombuffer(decoded_str, dtype=dtype).reshape(shape)
 
+def quantize_uint16(arr, max_step=0.01):
+    """pack coordinates to uint16 with a per axis scale and offset,
+    arr ~= quantized * scale + offset
+
+    Parameters
+    ----------
+    arr : array-like, shape=(n_atoms, 3)
+    max_step : float, default 0.01
+        largest allowed spacing between two quantized values
+
+    Returns
+    -------
+    out : (quantized, scale, offset) or None if the coordinates span
+        too large a range for max_step
+    """
+    arr = np.asarray(arr).reshape(-1, 3)
+    offset = arr.min(axis=0)
+    scale = (arr.max(axis=0) - offset) / 65535.
+    if scale.max() > max_step:
+        return None
+    # all values on this axis are equal
+    scale[scale == 0] = 1.
+    quantized = np.rint((arr - offset) / scale).astype('<u2')
+    return quantized, scale, offset
+
 def get_name(obj, kwargs):
     name = kwargs.pop('name', str(obj))
     if name.startswith('<nglview.'):
@@ -52,28 +96,61 @@ def get_repr_names_from_dict(repr_dict, component):
         return []
 
 
-def get_colors_from_b64(b64_image):
+def get_colors_from_b64(b64_image, bits=8):
     """
 
+    Parameters
+    ----------
+    b64_image : str
+        base64 encoded image
+    bits : int, default 8
+        number of high bits kept for each band of multi-band (RGB, RGBA)
+        images. Use smaller value (e.g 4) to merge antialiasing shades and
+        bound the number of colors to 2**(bits * n_bands).
+
     Examples
     --------
     >>> view.render_image()
     >>> get_colors_from_b64(view._image_data)
+    >>> get_colors_from_b64(view._image_data, bits=4)
 
     Returns
     -------
     list of tuple 
     """
     # should install PIL
-    # py3
-
-    from PIL import Image
-    import io, base64
+    global _Image
+    if _Image is None:
+        from PIL import Image as _Image
 
     fp = io.BytesIO(base64.b64decode(b64_image))
-    image = Image.open(fp)
+    image = _Image.open(fp)
+    pixels = np.asarray(image)
+
+    if pixels.ndim == 2:
+        # single band (e.g. 'L' or 'P' mode): PIL uses a plain histogram
+        return image.getcolors(int(1E6))
+
+    # pack kept bits of each band of a pixel in one uint32 so we can count in C
+    n_bands = pixels.shape[-1]
+    shift = 8 - bits
+    pixels = pixels.reshape(-1, n_bands).astype(np.uint32)
+    packed = np.zeros(pixels.shape[0], dtype=np.uint32)
+    for i in range(n_bands):
+        packed |= (pixels[:, i] >> shift) << (bits * i)
+
+    if bits * n_bands <= 16:
+        # small palette: count directly, no sorting
+        counts = np.bincount(packed, minlength=1 << (bits * n_bands))
+        colors = np.flatnonzero(counts)
+        counts = counts[colors]
+    else:
+        colors, counts = np.unique(packed, return_counts=True)
 
-    return image.getcolors(int(1E6))
+    mask = (1 << bits) - 1
+    bands = [(((colors >> (bits * i)) & mask) << shift).tolist()
+             for i in range(n_bands)]
+    return list(zip(counts.tolist(), zip(*bands)))
 
 
 def seq_to_string(seq):
@@ -83,7 +160,14 @@ def seq_to_string(seq):
         return seq
     else:
         # assume 1D array
-        return "@" + ",".join(str(s) for s in seq)
+        if hasattr(seq, 'tolist'):
+            # numpy array: convert to Python ints in C rather than
+            # calling str() on each numpy scalar
+            seq = seq.tolist()
+        return "@" + ",".join(map(str, seq))
+
+_CAMELIZE_CACHE = {}
+_CAMELIZE_CACHE_SIZE = 512
 
 def _camelize(snake):
     """
@@ -95,11 +179,47 @@ def _camelize(snake):
     >>> _camelize('remoteCall')
     remoteCall
     """
-    words = snake.split('_')
-    return words[0] + "".join(x.title() for x in words[1:])
+    try:
+        return _CAMELIZE_CACHE[snake]
+    except KeyError:
+        if '_' not in snake:
+            # already camel case or a single word
+            camel = snake
+        else:
+            words = snake.split('_')
+            camel = words[0] + "".join(x.title() for x in words[1:])
+        # keyword names are a small, closed vocabulary; bound it anyway
+        if len(_CAMELIZE_CACHE) < _CAMELIZE_CACHE_SIZE:
+            _CAMELIZE_CACHE[snake] = camel
+        return camel
 
 def _camelize_dict(kwargs):
-    return dict((_camelize(k), v) for k, v in kwargs.items())
+    return {_camelize(k): v for k, v in kwargs.items()}
+
+
+def _open_zip(src):
+    """open the first file in zip archive `src`
+    """
+    with ZipFile(src) as zf:
+        return zf.open(zf.namelist()[0])
+
+
+class _cached_property(object):
+    """like `property` but computed only once per instance
+
+    Notes
+    -----
+    functools.cached_property requires Python >= 3.8
+    """
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.func.__name__] = self.func(obj)
+        return value
 
 
 class FileManager(object):
@@ -121,7 +241,7 @@ class FileManager(object):
         self.cwd = os.getcwd()
         self._compressed = compressed
         self._ext = ext
-        self.unzip_backend = dict(gz=gzip, bz2=bz2, zip=ZipFile)
+        self.unzip_backend = dict(gz=gzip.open, bz2=bz2.BZ2File, zip=_open_zip)
 
     def read(self, force_buffer=False):
         """prepare content to send to NGL
@@ -130,16 +250,34 @@ class FileManager(object):
             return self.src
         else:
             if self.compressed_ext:
-                return self.unzip_backend[self.compressed_ext].open(self.src).read()
+                with self.unzip_backend[self.compressed_ext](self.src) as fh:
+                    return fh.read()
             elif hasattr(self.src, 'read'):
                 return self.src.read()
             else:
                 if self.is_filename:
-                    return open(self.src, 'rb').read()
+                    with open(self.src, 'rb') as fh:
+                        return fh.read()
                 else:
                     return self.src
 
-    @property
+    def read_chunks(self, chunk_size=1024**2):
+        """yield the (uncompressed) content of the file in chunks of `chunk_size` bytes,
+        without reading the whole file into memory
+        """
+        if self.compressed_ext:
+            opener = self.unzip_backend[self.compressed_ext]
+        else:
+            opener = lambda src: open(src, 'rb')
+
+        with opener(self.src) as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    @_cached_property
     def is_compressed(self):
         '''naive detection
         '''
@@ -153,25 +291,27 @@ class FileManager(object):
         else:
             return self._compressed
 
-    @property
+    @_cached_property
     def compressed_ext(self):
         if self.is_compressed and self.is_filename:
             return self.src.split('.')[-1]
         else:
             return ''
 
-    @property
+    @_cached_property
     def use_filename(self):
         if hasattr(self.src, 'read'):
             return False
         else:
             if self.is_filename:
-                cwd = os.getcwd()
                 root_path = os.path.dirname(os.path.abspath(self.src))
-                return (cwd in root_path)
+                # same folder or subfolder; plain substring test would
+                # accept e.g. /foobar for /foo
+                return (root_path == self.cwd or
+                        root_path.startswith(os.path.join(self.cwd, '')))
             return False
 
-    @property
+    @_cached_property
     def ext(self):
         if self._ext is not None:
             return self._ext
@@ -183,19 +323,19 @@ class FileManager(object):
             else:
                 return self.src.split('.')[-1]
 
-    @property
+    @_cached_property
     def is_filename(self):
         if hasattr(self.src, 'read'):
             return False
         else:
             return os.path.isfile(self.src)
 
-    @property
+    @_cached_property
     def is_binary(self):
         binary_exts = ["mmtf", "dcd", "mrc", "ccp4", "map", "dxbin"]
         return self.ext.lower() in binary_exts
 
-    @property
+    @_cached_property
     def is_url(self):
         return (isinstance(self.src, string_types) and
                 ((self.src.startswith('http') or
@@ -1,18 +1,23 @@
 from __future__ import print_function, absolute_import
 
+import os
+import atexit
 import time
-import base64
+import hashlib
 import uuid
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 import numpy as np 
 from IPython.display import display
 from ipywidgets import DOMWidget, widget_image
 from traitlets import (Unicode, Bool, Dict, List, Int, observe,
                        CaselessStrEnum)
 
-from .utils import py_utils, js_utils, widget_utils
+from .utils import py_utils, js_utils
 from .utils.py_utils import (seq_to_string, string_types, _camelize_dict,
                              FileManager, get_repr_names_from_dict,
-                             encode_base64,
+                             encode_base64, quantize_uint16,
                              _update_url)
 from .player import TrajectoryPlayer
 from . import interpolate
@@ -27,14 +32,42 @@ from . import default
 
 __all__ = ['NGLWidget', 'ComponentViewer']
 
+_thread_pool = None
+# coordinates to cast or quantize larger than this (in bytes, all trajectories)
+# are converted in parallel, below it the thread hand-off costs more than it saves
+_PARALLEL_PACK_MIN_BYTES = 16 * 1024**2
 
-def _add_repr_method_shortcut(self, other):
-    from types import MethodType
+def _get_thread_pool():
+    """shared by all widgets, created on first use
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        from multiprocessing.pool import ThreadPool
+        _thread_pool = ThreadPool(4)
+        atexit.register(_close_thread_pool)
+    return _thread_pool
+
+def _close_thread_pool():
+    global _thread_pool
+    if _thread_pool is not None:
+        _thread_pool.terminate()
+        _thread_pool = None
+
+def _is_f4_contiguous(arr):
+    """True if `arr` can be sent as float32 without a copy
+    """
+    arr = np.asarray(arr)
+    return arr.dtype == np.dtype('<f4') and arr.flags.c_contiguous
+
+def _add_repr_method_shortcut(cls):
+    """add `add_{repr}`, `update_{repr}` and `remove_{repr}` methods to `cls`.
+    They are created once per class, not for every instance.
+    """
 
     def make_func_add(rep):
         """return a new function object
         """
-        def func(this, selection='all', **kwargs):
+        def func(self, selection='all', **kwargs):
             """
             """
             self.add_representation(repr_type=rep[1], selection=selection, **kwargs)
@@ -51,7 +84,7 @@ def _add_repr_method_shortcut(self, other):
     def make_func_remove(rep):
         """return a new function object
         """
-        def func(this, **kwargs):
+        def func(self, **kwargs):
             """
             """
             self._remove_representations_by_name(repr_name=rep[1], **kwargs)
@@ -60,7 +93,7 @@ def _add_repr_method_shortcut(self, other):
     def make_func_update(rep):
         """return a new function object
         """
-        def func(this, **kwargs):
+        def func(self, **kwargs):
             """
             """
             self._update_representations_by_name(repr_name=rep[1], **kwargs)
@@ -72,8 +105,11 @@ def _add_repr_method_shortcut(self, other):
                                    (make_func_remove, 'remove')]:
             func= make_func(rep)
             fn = '_'.join((root_fn, rep[0]))
-            setattr(self, fn, MethodType(func, other))
+            func.__name__ = fn
+            setattr(cls, fn, func)
+    return cls
 
+@_add_repr_method_shortcut
 class NGLWidget(DOMWidget):
     _view_name = Unicode("NGLView").tag(sync=True)
     _view_module = Unicode("nglview-js").tag(sync=True)
@@ -101,11 +137,15 @@ class NGLWidget(DOMWidget):
     _ngl_component_names = List().tag(sync=False)
     n_components = Int(0).tag(sync=True)
 
-    displayed = False
+    _displayed = False
     _ngl_msg = None
     _send_binary = Bool(True).tag(sync=False)
     _init_gui = Bool(False).tag(sync=False)
     _hold_image = Bool(False).tag(sync=False)
+    # max number of frames kept by _get_coordinates
+    _coordinates_cache_size = 64
+    # files larger than this (in bytes) are sent in chunks by _load_data
+    _stream_min_size = 16 * 1024**2
 
     def __init__(self, structure=None, representations=None, parameters=None, **kwargs):
         super(NGLWidget, self).__init__(**kwargs)
@@ -118,15 +158,36 @@ class NGLWidget(DOMWidget):
         self._image_array = []
         # do not use _displayed_callbacks since there is another Widget._display_callbacks
         self._ngl_displayed_callbacks = []
-        _add_repr_method_shortcut(self, self)
+        # list of call_method messages while in `_batched`
+        self._msg_batch = None
+        # component index -> representation names of `_repr_dict`,
+        # reset when NGL sends a new `_repr_dict`
+        self._repr_names_cache = {}
         self.shape = Shape(view=self)
 
         # register to get data from JS side
         self.on_msg(self._ngl_handle_msg)
 
         self._trajlist = []
+        # trajectory.id -> trajectory, same items as _trajlist
+        self._trajdict = {}
+        # component index -> ComponentViewer, reset by remove_component
+        self._component_viewers = {}
+        # component id -> visibility last sent to NGL (missing: visible)
+        self._visibilities = {}
+        # see bulk_add
+        self._bulk_depth = 0
+        self._bulk_center_component = None
+        # (trajectory.id, index) -> coordinates, least recently used first
+        self._coordinates_cache = OrderedDict()
+        # trajectory readers are not thread safe, serialize access to them
+        self._coordinates_lock = threading.Lock()
+        self._prefetch_thread = None
+        self._coordinates_sent_signature = None
 
         self._ngl_component_ids = []
+        # component id -> index in _ngl_component_ids
+        self._component_indices = {}
         self._init_structures = []
         if parameters:
             self.parameters = parameters
@@ -207,6 +268,9 @@ class NGLWidget(DOMWidget):
 
     @observe('picked')
     def _on_picked(self, change):
+        # the Picked text box reads view.picked when it is created
+        if self.player.widget_picked is None:
+            return
         import json
         picked = change['new']
         self.player.widget_picked.value = json.dumps(picked)
@@ -219,17 +283,17 @@ class NGLWidget(DOMWidget):
     @observe('_n_dragged_files')
     def on_update_dragged_file(self, change):
         if change['new'] - change['old'] == 1:
-            self._ngl_component_ids.append(uuid.uuid4())
+            self._add_component_id(uuid.uuid4())
 
     @observe('n_components')
     def _handle_n_components_changed(self, change):
         if self.player.widget_repr is not None:
-            component_slider = widget_utils.get_widget_by_name(self.player.widget_repr, 'component_slider')
+            component_slider = self.player.widget_component_slider
 
             if change['new'] - 1 >= component_slider.min:
                 component_slider.max = change['new'] - 1
 
-            component_dropdown = widget_utils.get_widget_by_name(self.player.widget_repr, 'component_dropdown')
+            component_dropdown = self.player.widget_component_dropdown
             component_dropdown.options = tuple(self._ngl_component_names)
 
             if change['new'] == 0:
@@ -238,28 +302,29 @@ class NGLWidget(DOMWidget):
 
                 component_slider.max = 0
 
-                reprlist_choices = widget_utils.get_widget_by_name(self.player.widget_repr, 'reprlist_choices')
+                reprlist_choices = self.player.widget_repr_choices
                 reprlist_choices.options = tuple([''])
 
-                repr_slider = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_slider')
+                repr_slider = self.player.widget_repr_slider
                 repr_slider.max = 0
 
-                repr_name_text = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_name_text')
-                repr_selection = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_selection')
+                repr_name_text = self.player.widget_repr_name
+                repr_selection = self.player.widget_repr_selection
                 repr_name_text.value = ' '
                 repr_selection.value = ' '
 
     @observe('_repr_dict')
     def _handle_repr_dict_changed(self, change):
+        self._repr_names_cache = {}
         if self.player.widget_repr is not None:
-            repr_slider = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_slider')
-            component_slider = widget_utils.get_widget_by_name(self.player.widget_repr, 'component_slider')
+            repr_slider = self.player.widget_repr_slider
+            component_slider = self.player.widget_component_slider
 
-            repr_name_text = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_name_text')
-            repr_selection = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_selection')
+            repr_name_text = self.player.widget_repr_name
+            repr_selection = self.player.widget_repr_selection
 
-            reprlist_choices = widget_utils.get_widget_by_name(self.player.widget_repr, 'reprlist_choices')
-            repr_names = get_repr_names_from_dict(self._repr_dict, component_slider.value)
+            reprlist_choices = self.player.widget_repr_choices
+            repr_names = self._get_repr_names(component_slider.value)
 
             if change['new'] == {'c0': {}}:
                 repr_selection.value = ''
@@ -281,6 +346,15 @@ class NGLWidget(DOMWidget):
 
                 repr_slider.max = len(repr_names) - 1 if len(repr_names) >= 1 else len(repr_names)
 
+    def _get_repr_names(self, component):
+        """representation names of `component`, cached until `_repr_dict` changes
+        """
+        names = self._repr_names_cache.get(component)
+        if names is None:
+            names = get_repr_names_from_dict(self._repr_dict, component)
+            self._repr_names_cache[component] = names
+        return list(names)
+
     def _update_count(self):
          self.count = max(traj.n_frames for traj in self._trajlist if hasattr(traj,
                          'n_frames'))
@@ -301,6 +375,7 @@ class NGLWidget(DOMWidget):
         If you are visualizing a trajectory with more than 1 frame, you can use the
         player slider to trigger the refreshing.
         """
+        self._clear_coordinates_cache()
         current_frame = self.frame 
         self.frame = int(1E6)
         self.frame = current_frame
@@ -407,7 +482,7 @@ class NGLWidget(DOMWidget):
         >>> # component 1
         >>> view.color_by('atomindex', component=1)
         '''
-        repr_names = get_repr_names_from_dict(self._repr_dict, component)
+        repr_names = self._get_repr_names(component)
 
         for index, _ in enumerate(repr_names):
             self.update_representation(component=component,
@@ -420,8 +495,10 @@ class NGLWidget(DOMWidget):
     @representations.setter
     def representations(self, reps):
         self._representations = reps[:]
+        calls = []
         for index in range(len(self._ngl_component_ids)):
-            self.set_representations(reps)
+            calls.extend(self._get_set_representations_calls(reps, component=index))
+        self._remote_call_batch(calls)
 
     def update_representation(self, component=0, repr_index=0, **parameters):
         """
@@ -452,16 +529,22 @@ class NGLWidget(DOMWidget):
         ----------
         representations : list of dict
         """
-        self.clear_representations(component=component)
+        self._remote_call_batch(self._get_set_representations_calls(representations,
+                                                                    component=component))
+
+    def _get_set_representations_calls(self, representations, component=0):
+        calls = [dict(method_name='clearRepresentations',
+                      target='compList',
+                      kwargs={'component_index': component})]
 
         for params in representations:
             assert isinstance(params, dict), 'params must be a dict'
-            kwargs = params['params']
-            kwargs.update({'component_index': component})
-            self._remote_call('addRepresentation',
+            kwargs = dict(params['params'], component_index=component)
+            calls.append(dict(method_name='addRepresentation',
                               target='compList',
                               args=[params['type'],],
-                              kwargs=kwargs)
+                              kwargs=kwargs))
+        return calls
 
     def _remove_representation(self, component=0, repr_index=0):
         self._remote_call('removeRepresentation',
@@ -512,27 +595,91 @@ class NGLWidget(DOMWidget):
         '''
         if self._trajlist:
             coordinates_dict = {}
+            component_indices = self._component_indices
             for trajectory in self._trajlist:
-                traj_index = self._ngl_component_ids.index(trajectory.id)
+                traj_index = component_indices[trajectory.id]
 
                 try:
                     if trajectory.shown:
-                        if self.player.interpolate:
+                        if self.player.interpolate and not self.player.js_interpolate:
                             t = self.player.iparams.get('t', 0.5)
                             step = self.player.iparams.get('step', 1)
-                            coordinates_dict[traj_index] = interpolate.linear(index,
-                                        t=t, traj=trajectory, step=step)
+                            # a prefetch thread may be reading this trajectory
+                            with self._coordinates_lock:
+                                coordinates_dict[traj_index] = interpolate.linear(index,
+                                            t=t, traj=trajectory, step=step)
                         else:
-                            coordinates_dict[traj_index] = trajectory.get_coordinates(index)
+                            coordinates_dict[traj_index] = self._get_coordinates(trajectory, index)
                     else:
                         coordinates_dict[traj_index] = np.empty((0), dtype='f4')
                 except (IndexError, ValueError):
                     coordinates_dict[traj_index] = np.empty((0), dtype='f4')
 
-            self.coordinates_dict = coordinates_dict
+            # a new frame: no need to check if JS already shows these coordinates
+            self._coordinates_dict = coordinates_dict
+            self._send_coordinates()
+            if self.player.prefetch:
+                self._prefetch_coordinates(index + self.player.step)
         else:
             print("no trajectory available")
 
+    def _get_coordinates(self, trajectory, index):
+        """return coordinates of `trajectory` at `index`, reusing
+        recently visited frames instead of reading them again
+
+        Only frames of trajectories read from disk are kept (see
+        `Trajectory._reads_from_disk`), in-memory ones can be edited in place.
+        """
+        if not getattr(trajectory, '_reads_from_disk', False):
+            return trajectory.get_coordinates(index)
+
+        key = (trajectory.id, index)
+        cache = self._coordinates_cache
+        with self._coordinates_lock:
+            try:
+                arr = cache.pop(key)
+            except KeyError:
+                arr = trajectory.get_coordinates(index)
+                if len(cache) >= self._coordinates_cache_size:
+                    cache.popitem(last=False)
+            cache[key] = arr
+        return arr
+
+    def _prefetch_coordinates(self, index):
+        """read `index`-th frame of shown trajectories into the cache in a background
+        thread, so the disk read overlaps with rendering of the current frame during
+        playback (see `player.prefetch`)
+
+        Only trajectories read from disk are prefetched: reading a frame of the
+        others may move a cursor the user holds (e.g. MDAnalysis Universe).
+        """
+        if not 0 <= index < self.count:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+
+        trajectories = [trajectory for trajectory in self._trajlist
+                        if trajectory.shown and getattr(trajectory, '_reads_from_disk', False)]
+        if not trajectories:
+            return
+
+        def fetch():
+            for trajectory in trajectories:
+                try:
+                    self._get_coordinates(trajectory, index)
+                except Exception:
+                    # best effort, _set_coordinates will handle the error if
+                    # this frame is really requested
+                    pass
+
+        self._prefetch_thread = threading.Thread(target=fetch)
+        self._prefetch_thread.daemon = True
+        self._prefetch_thread.start()
+
+    def _clear_coordinates_cache(self):
+        with self._coordinates_lock:
+            self._coordinates_cache.clear()
+
     @property
     def coordinates_dict(self):
         """
@@ -547,24 +694,74 @@ class NGLWidget(DOMWidget):
     @coordinates_dict.setter
     def coordinates_dict(self, arr_dict):
         self._coordinates_dict = arr_dict
+        # direct assignment may repeat what JS already shows
+        signature = self._get_coordinates_signature(arr_dict)
+        if signature == self._coordinates_sent_signature:
+            return
+        # send right away: messages must reach JS in the order they were made
+        # (e.g. `render_image` right after setting `frame`). Dragging the frame
+        # slider is rate limited on the JS side.
+        self._send_coordinates()
+        self._coordinates_sent_signature = signature
+
+    def _send_coordinates(self):
+        coordinates_dict = self._coordinates_dict
+        self._coordinates_sent_signature = None
+
+        # hidden trajectories have empty coordinates, JS has nothing to update for them
+        indices = sorted(index for index, arr in coordinates_dict.items() if np.size(arr))
+
+        if self._msg_batch:
+            # keep the order of messages inside `_batched`
+            self._flush_msg_batch()
 
         if not self._send_binary:
             # send base64
-            encoded_coordinates_dict = dict((k, encode_base64(v))
-                                 for (k, v) in self._coordinates_dict.items())
-            mytime = time.time() * 1000
-            self.send({'type': 'base64_single', 'data': encoded_coordinates_dict,
-                'mytime': mytime})
+            encoded_coordinates_dict = dict((index, encode_base64(coordinates_dict[index]))
+                                            for index in indices)
+            self.send({'type': 'base64_single', 'data': encoded_coordinates_dict})
         else:
             # send binary
-            buffers = []
-            coordinates_meta = dict()
-            for index, arr in self._coordinates_dict.items():
-                buffers.append(arr.astype('f4').tobytes())
-                coordinates_meta[index] = index
-            mytime = time.time() * 1000
-            self.send({'type': 'binary_single', 'data': coordinates_meta,
-                'mytime': mytime}, buffers=buffers)
+            quant16 = self.player.quant16
+
+            def pack(index):
+                """return (buffer, meta) for coordinates_dict[index]
+                """
+                arr = coordinates_dict[index]
+                packed = quantize_uint16(arr) if quant16 else None
+                if packed is None:
+                    # ascontiguousarray returns arr itself if it is already little-endian,
+                    # C-contiguous float32, so the buffer shares memory with the array
+                    return memoryview(np.ascontiguousarray(arr, dtype='<f4')), index
+                quantized, scale, offset = packed
+                return memoryview(quantized), {'scale': scale.tolist(),
+                                               'offset': offset.tolist()}
+
+            # float32 arrays are sent as they are, only casting/quantizing costs time
+            pack_nbytes = sum(np.asarray(coordinates_dict[index]).nbytes for index in indices
+                              if quant16 or not _is_f4_contiguous(coordinates_dict[index]))
+            if len(indices) > 1 and pack_nbytes >= _PARALLEL_PACK_MIN_BYTES:
+                # NumPy releases the GIL while casting, convert the arrays in parallel
+                packed_list = _get_thread_pool().map(pack, indices)
+            else:
+                packed_list = [pack(index) for index in indices]
+
+            # JS pairs buffers with the sorted keys of coordinates_meta
+            buffers = [buf for buf, _ in packed_list]
+            coordinates_meta = dict((index, meta) for index, (_, meta)
+                                    in zip(indices, packed_list))
+            msg = {'type': 'binary_single', 'data': coordinates_meta}
+            if self.player.interpolate and self.player.js_interpolate:
+                msg['iparams'] = {'type': 'linear',
+                                  'steps': self.player.iparams.get('steps', 4)}
+            self.send(msg, buffers=buffers)
+
+    def _get_coordinates_signature(self, coordinates_dict):
+        signature = [self._send_binary]
+        for index in sorted(coordinates_dict):
+            arr = np.ascontiguousarray(coordinates_dict[index])
+            signature.append((index, arr.dtype.str, arr.shape, hashlib.sha1(arr).digest()))
+        return tuple(signature)
 
     @observe('frame')
     def on_frame_changed(self, change):
@@ -799,14 +996,11 @@ class NGLWidget(DOMWidget):
                 data_dict = self._ngl_msg.get('data')
                 name = data_dict.pop('name') + '\n'
                 selection = data_dict.get('sele', '') + '\n'
-                # json change True to true
-                data_dict_json = json.dumps(data_dict).replace('true', 'True').replace('false', 'False')
-                data_dict_json = data_dict_json.replace('null', '"null"')
 
                 if self.player.widget_repr is not None:
                     # TODO: refactor
-                    repr_name_text = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_name_text')
-                    repr_selection = widget_utils.get_widget_by_name(self.player.widget_repr, 'repr_selection')
+                    repr_name_text = self.player.widget_repr_name
+                    repr_selection = self.player.widget_repr_selection
                     repr_name_text.value = name
                     repr_selection.value = selection
 
@@ -852,9 +1046,11 @@ class NGLWidget(DOMWidget):
             self._init_structures.append(structure)
             name = py_utils.get_name(structure, kwargs)
             self._ngl_component_names.append(name)
-        self._ngl_component_ids.append(structure.id)
-        self.center_view(component=len(self._ngl_component_ids)-1)
-        self._update_component_auto_completion()
+        self._add_component_id(structure.id)
+        if self._bulk_depth:
+            self._bulk_center_component = len(self._ngl_component_ids)-1
+        else:
+            self.center_view(component=len(self._ngl_component_ids)-1)
 
     def add_trajectory(self, trajectory, **kwargs):
         '''add new trajectory to `view`
@@ -896,22 +1092,57 @@ class NGLWidget(DOMWidget):
             name = py_utils.get_name(trajectory, kwargs)
             self._ngl_component_names.append(name)
         setattr(trajectory, 'shown', True)
+        self._clear_coordinates_cache()
         self._trajlist.append(trajectory)
-        self._update_count()
-        self._ngl_component_ids.append(trajectory.id)
-        self._update_component_auto_completion()
+        self._trajdict[trajectory.id] = trajectory
+        if not self._bulk_depth:
+            self._update_count()
+        self._add_component_id(trajectory.id)
+
+    @contextmanager
+    def bulk_add(self):
+        """add many structures/trajectories at once: messages to NGL are sent as a
+        single batch and the frame count and centering are updated once at the end
 
-    def add_pdbid(self, pdbid):
+        Examples
+        --------
+        >>> view = nv.NGLWidget()
+        >>> with view.bulk_add():
+        ...     for fn in pdb_files:
+        ...         view.add_structure(nv.FileStructure(fn))
+        """
+        self._bulk_depth += 1
+        with self._batched():
+            try:
+                yield
+            finally:
+                self._bulk_depth -= 1
+                if not self._bulk_depth:
+                    if self._trajlist:
+                        self._update_count()
+                    if self._bulk_center_component is not None:
+                        self.center_view(component=self._bulk_center_component)
+                        self._bulk_center_component = None
+
+    def add_pdbid(self, pdbid, ext='pdb'):
         '''add new Structure view by fetching pdb id from rcsb
 
+        Parameters
+        ----------
+        pdbid : str
+        ext : str, {'pdb', 'cif', 'mmtf'}, default 'pdb'
+            file format to fetch. 'mmtf' is binary and smaller, but it needs an
+            MMTF server: the bundled NGL fetches it from mmtf.rcsb.org.
+
         Examples
         --------
         >>> view = nglview.NGLWidget()
         >>> view.add_pdbid('1tsu')
         >>> # which is equal to 
         >>> # view.add_component('rcsb://1tsu.pdb')
+        >>> view.add_pdbid('1tsu', ext='cif')
         '''
-        self.add_component('rcsb://{}.pdb'.format(pdbid))
+        self.add_component('rcsb://{}.{}'.format(pdbid, ext))
 
     def add_component(self, filename, **kwargs):
         '''add component from file/trajectory/struture
@@ -934,8 +1165,7 @@ class NGLWidget(DOMWidget):
         '''
         self._load_data(filename, **kwargs)
         # assign an ID
-        self._ngl_component_ids.append(str(uuid.uuid4()))
-        self._update_component_auto_completion()
+        self._add_component_id(str(uuid.uuid4()))
 
     def _load_data(self, obj, **kwargs):
         '''
@@ -944,17 +1174,24 @@ class NGLWidget(DOMWidget):
         ----------
         obj : nglview.Structure or any object having 'get_structure_string' method or
               string buffer (open(fn).read())
+        stream : bool, optional
+            send file content in chunks, see `_load_data_streaming`.
+            Default: True for files larger than `_stream_min_size` that are
+            not in the current folder. An explicit True also streams files in
+            the current folder, instead of letting NGL read them by path.
         '''
+        stream = kwargs.pop('stream', None)
         kwargs2 = _camelize_dict(kwargs)
 
-        try:
-            is_url = FileManager(obj).is_url
-        except NameError:
-            is_url = False
+        fh = FileManager(obj,
+                         ext=kwargs.get('ext'),
+                         compressed=kwargs.get('compressed'))
+        is_url = fh.is_url
 
         if 'defaultRepresentation' not in kwargs2:
             kwargs2['defaultRepresentation'] = True
 
+        buffers = None
         if not is_url:
             if hasattr(obj, 'get_structure_string'):
                 blob = obj.get_structure_string()
@@ -962,11 +1199,6 @@ class NGLWidget(DOMWidget):
                 passing_buffer = True
                 binary = False
             else:
-                fh = FileManager(obj,
-                                 ext=kwargs.get('ext'),
-                                 compressed=kwargs.get('compressed'))
-                # assume passing string
-                blob = fh.read()
                 passing_buffer = not fh.use_filename
 
                 if fh.ext is None and passing_buffer:
@@ -976,9 +1208,22 @@ class NGLWidget(DOMWidget):
                 binary = fh.is_binary
                 use_filename = fh.use_filename
 
+                if fh.is_filename and (stream or passing_buffer):
+                    if stream is None:
+                        stream = os.path.getsize(fh.src) > self._stream_min_size
+                    if stream:
+                        name = py_utils.get_name(obj, kwargs2)
+                        self._ngl_component_names.append(name)
+                        self._load_data_streaming(fh, binary, kwargs2)
+                        return
+
+                # assume passing string
+                blob = fh.read()
+
             if binary and not use_filename:
-                # send base64
-                blob = base64.b64encode(blob).decode('utf8')
+                # send raw bytes as comm buffer, JS reads msg.buffers[bufferIndex]
+                buffers = [blob,]
+                blob = {'bufferIndex': 0}
             blob_type = 'blob' if passing_buffer else 'path'
             args=[{'type': blob_type, 'data': blob, 'binary': binary}]
         else:
@@ -992,7 +1237,35 @@ class NGLWidget(DOMWidget):
         self._remote_call("loadFile",
                 target='Stage',
                 args=args,
-                kwargs=kwargs2)
+                kwargs=kwargs2,
+                buffers=buffers)
+
+    def _load_data_streaming(self, fh, binary, kwargs, chunk_size=1024**2):
+        """send file content in messages of `chunk_size` bytes instead of a single
+        one, so the whole file is never in memory. JS joins the chunks and loads
+        them as one file.
+
+        Before the widget is displayed the messages are queued in
+        `_ngl_displayed_callbacks`, so the chunks (the whole file) stay in memory
+        until then.
+
+        Parameters
+        ----------
+        fh : FileManager
+        binary : bool
+        kwargs : dict
+            passed to NGL's Stage.loadFile
+        """
+        stream_id = str(uuid.uuid4())
+        for chunk in fh.read_chunks(chunk_size):
+            self._remote_call('appendChunk',
+                    target='Widget',
+                    args=[stream_id,],
+                    buffers=[chunk,])
+        self._remote_call('loadStream',
+                target='Widget',
+                args=[stream_id, binary],
+                kwargs=kwargs)
 
     def remove_component(self, component_id):
         """remove component by its uuid
@@ -1005,22 +1278,27 @@ class NGLWidget(DOMWidget):
         >>> # remove last component
         >>> view.remove_component(view._ngl_component_ids[-1])
         """
-        self._clear_component_auto_completion()
-        if self._trajlist:
-            for traj in self._trajlist:
-                if traj.id == component_id:
-                    self._trajlist.remove(traj)
-        component_index = self._ngl_component_ids.index(component_id)
-        self._ngl_component_ids.remove(component_id)
+        self._component_viewers.clear()
+        self._visibilities.pop(component_id, None)
+        traj = self._trajdict.pop(component_id, None)
+        if traj is not None:
+            self._trajlist.remove(traj)
+            self._clear_coordinates_cache()
+        component_index = self._component_indices.pop(component_id)
+        del self._ngl_component_ids[component_index]
         self._ngl_component_names.pop(component_index)
+        for cid in self._ngl_component_ids[component_index:]:
+            self._component_indices[cid] -= 1
 
         self._remote_call('removeComponent',
                 target='Stage',
                 args=[component_index,])
-        
-        self._update_component_auto_completion()
 
-    def _remote_call(self, method_name, target='Widget', args=None, kwargs=None):
+    def _add_component_id(self, component_id):
+        self._component_indices[component_id] = len(self._ngl_component_ids)
+        self._ngl_component_ids.append(component_id)
+
+    def _remote_call(self, method_name, target='Widget', args=None, kwargs=None, buffers=None):
         """call NGL's methods from Python.
         
         Parameters
@@ -1031,6 +1309,9 @@ class NGLWidget(DOMWidget):
         kwargs : dict
             if target is 'compList', "component_index" could be passed
             to specify which component will call the method.
+        buffers : list of bytes, optional
+            binary data sent along with the message. Inside `_batched`, a call
+            with buffers is sent on its own, after the calls collected so far.
 
         Examples
         --------
@@ -1045,56 +1326,137 @@ class NGLWidget(DOMWidget):
                           args=[True, "1-12"],
                           kwargs={'component_index': 1})
         """
+        msg = self._get_remote_call_msg(method_name, target=target,
+                                        args=args, kwargs=kwargs)
+        if self._msg_batch is not None:
+            if buffers is None:
+                self._msg_batch.append(msg)
+                return
+            # keep the order of calls
+            self._flush_msg_batch()
+        self._send_or_queue(msg, method_name, buffers=buffers)
+
+    @contextmanager
+    def _batched(self):
+        """collect all `_remote_call` inside this block and send them
+        as a single message at the end
+
+        Examples
+        --------
+        with view._batched():
+            for index in range(view.n_components):
+                view._remote_call('setVisibility', target='compList',
+                                  args=[False,], kwargs={'component_index': index})
+        """
+        if self._msg_batch is not None:
+            # nested, the outermost block sends
+            yield
+            return
+
+        self._msg_batch = []
+        try:
+            yield
+        finally:
+            self._flush_msg_batch()
+            self._msg_batch = None
+
+    def _flush_msg_batch(self):
+        """send the calls collected by `_batched` so far
+        """
+        msgs, self._msg_batch = self._msg_batch, []
+        if msgs:
+            self._send_or_queue({'type': 'call_batch', 'data': msgs}, 'call_batch')
+
+    def _remote_call_batch(self, calls):
+        """call several NGL's methods with a single message
+
+        Parameters
+        ----------
+        calls : list of dict
+            each dict has the keywords of `_remote_call`
+
+        Examples
+        --------
+        view._remote_call_batch([dict(method_name='clearRepresentations',
+                                      target='compList',
+                                      kwargs={'component_index': 0}),
+                                 dict(method_name='addRepresentation',
+                                      target='compList',
+                                      args=['cartoon'],
+                                      kwargs={'component_index': 0})])
+        """
+        with self._batched():
+            for call in calls:
+                self._remote_call(**call)
+
+    def _get_remote_call_msg(self, method_name, target='Widget', args=None, kwargs=None):
         args = [] if args is None else args
         kwargs = {} if kwargs is None else kwargs
 
-        msg = {}
+        msg = {'target': target,
+               'type': 'call_method',
+               'methodName': method_name,
+               'args': args,
+               'kwargs': kwargs}
 
         if 'component_index' in kwargs:
             msg['component_index'] = kwargs.pop('component_index')
         if 'repr_index' in kwargs:
             msg['repr_index'] = kwargs.pop('repr_index')
+        return msg
 
-        msg['target'] = target
-        msg['type'] = 'call_method'
-        msg['methodName'] = method_name
-        msg['args'] = args
-        msg['kwargs'] = kwargs
+    @property
+    def displayed(self):
+        return self._displayed
 
-        if self.displayed is True:
-            self.send(msg)
-        else:
-            # send later
-            def callback(widget, msg=msg):
-                widget.send(msg)
+    @displayed.setter
+    def displayed(self, value):
+        self._displayed = value
+        # pick how to send messages once, not for every `_remote_call`
+        self._send_or_queue = self._send_now if value is True else self._send_later
+
+    def _send_now(self, msg, method_name, buffers=None):
+        self.send(msg, buffers=buffers)
+
+    def _send_later(self, msg, method_name, buffers=None):
+        def callback(widget, msg=msg):
+            widget.send(msg, buffers=buffers)
 
-            callback._method_name = method_name
+        callback._method_name = method_name
 
-            # all callbacks will be called right after widget is loaded
-            self._ngl_displayed_callbacks.append(callback)
+        # all callbacks will be called right after widget is loaded
+        self._ngl_displayed_callbacks.append(callback)
+
+    # replaced by `_send_now` when the widget is displayed, see `displayed`
+    _send_or_queue = _send_later
 
     def _get_traj_by_id(self, itsid):
         """return nglview.Trajectory or its derived class object
         """
-        for traj in self._trajlist:
-            if traj.id == itsid:
-                return traj
-        return None
+        return self._trajdict.get(itsid)
 
     def hide(self, indices):
         """set invisibility for given component/struture/trajectory (by their indices)
         """
-        traj_ids = set(traj.id for traj in self._trajlist)
-
-        for index in indices:
-            comp_id = self._ngl_component_ids[index]
-            if comp_id in traj_ids:
-                traj = self._get_traj_by_id(comp_id)
-                traj.shown = False
-            self._remote_call("setVisibility",
-                    target='compList',
-                    args=[False,],
-                    kwargs={'component_index': index})
+        component_ids = self._ngl_component_ids
+        get_traj = self._trajdict.get
+        remote_call = self._remote_call
+        visibilities = self._visibilities
+
+        with self._batched():
+            for index in indices:
+                comp_id = component_ids[index]
+                traj = get_traj(comp_id)
+                if traj is not None:
+                    traj.shown = False
+                if not visibilities.get(comp_id, True):
+                    # already hidden
+                    continue
+                visibilities[comp_id] = False
+                remote_call("setVisibility",
+                        target='compList',
+                        args=[False,],
+                        kwargs={'component_index': index})
 
     def show(self, *args):
         """shortcut of `show_only`
@@ -1108,31 +1470,28 @@ class NGLWidget(DOMWidget):
         ----------
         indices : {'all', array-like}, component index, default 'all'
         """
-        traj_ids = set(traj.id for traj in self._trajlist)
-
         if indices == 'all':
             indices_ = set(range(self.n_components))
         else:
             indices_ = set(indices)
 
-        for index, comp_id in enumerate(self._ngl_component_ids):
-            if comp_id in traj_ids:
-                traj = self._get_traj_by_id(comp_id)
-            else:
-                traj = None
-            if index in indices_:
-                args = [True,]
-                if traj is not None:
-                    traj.shown = True
-            else:
-                args = [False,]
-                if traj is not None:
-                    traj.shown = False
+        component_ids = self._ngl_component_ids
+        get_traj = self._trajdict.get
 
-            self._remote_call("setVisibility",
-                    target='compList',
-                    args=args,
-                    kwargs={'component_index': index})
+        visibilities = [index in indices_ for index in range(len(component_ids))]
+        for comp_id, visible in zip(component_ids, visibilities):
+            traj = get_traj(comp_id)
+            if traj is not None:
+                traj.shown = visible
+
+        current = [self._visibilities.get(comp_id, True) for comp_id in component_ids]
+        if visibilities == current:
+            return
+        self._visibilities = dict(zip(component_ids, visibilities))
+
+        self._remote_call("setVisibilityBulk",
+                target='Widget',
+                args=[visibilities,])
 
     def _js_console(self):
         self.send(dict(type='get', data='any'))
@@ -1147,27 +1506,50 @@ class NGLWidget(DOMWidget):
         return display.Image(self._image_data)
 
     def _clear_component_auto_completion(self):
-        for index, _ in enumerate(self._ngl_component_ids):
-            name = 'component_' + str(index)
-            delattr(self, name)
+        """kept for backward compatibility, see `__getattr__`"""
+        pass
 
     def _update_component_auto_completion(self):
-        trajids = [traj.id for traj in self._trajlist]
-
-        for index, cid in enumerate(self._ngl_component_ids):
-            comp = ComponentViewer(self, index) 
-            name = 'component_' + str(index)
-            setattr(self, name, comp)
+        """kept for backward compatibility, see `__getattr__`"""
+        pass
 
-            if cid in trajids:
-                traj_name = 'trajectory_' + str(trajids.index(cid))
-                setattr(self, traj_name, comp)
+    def __getattr__(self, name):
+        """make `component_<index>` and `trajectory_<index>` on demand
+        """
+        prefix, _, index = name.rpartition('_')
+        if prefix in ('component', 'trajectory') and index.isdigit():
+            index = int(index)
+            if prefix == 'trajectory':
+                if index < len(self._trajlist):
+                    cid = self._trajlist[index].id
+                    if cid in self._component_indices:
+                        return self[self._component_indices[cid]]
+            elif index < len(self._ngl_component_ids):
+                return self[index]
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (self.__class__.__name__, name))
+
+    def __dir__(self):
+        names = set(dir(self.__class__))
+        names.update(self.__dict__)
+        names.update('component_' + str(index)
+                     for index in range(len(self._ngl_component_ids)))
+        names.update('trajectory_' + str(index)
+                     for index in range(len(self._trajlist)))
+        return sorted(names)
 
     def __getitem__(self, index):
         """return ComponentViewer
         """
-        assert index < len(self._ngl_component_ids)
-        return ComponentViewer(self, index) 
+        n_components = len(self._ngl_component_ids)
+        if index < 0:
+            # cache by position: view[-1] changes when a component is added
+            index += n_components
+        assert 0 <= index < n_components
+        comp = self._component_viewers.get(index)
+        if comp is None:
+            comp = self._component_viewers[index] = ComponentViewer(self, index)
+        return comp
 
     def __iter__(self):
         """return ComponentViewer
@@ -1194,6 +1576,7 @@ class NGLWidget(DOMWidget):
         self._remote_call('setDialog', target='Widget')
 
 
+@_add_repr_method_shortcut
 class ComponentViewer(object):
     """Convenient attribute for NGLWidget. See example below.
 
@@ -1207,11 +1590,14 @@ class ComponentViewer(object):
     >>> view.component_1.add_licorice()
     >>> view.remove_component(view.comp1.id)
     """
+    # no per-instance __dict__; borrowed attributes live in `_borrowed`
+    __slots__ = ('_view', '_index', '_borrowed', '_trajectory_atts')
 
     def __init__(self, view, index):
         self._view = view
         self._index = index
-        _add_repr_method_shortcut(self, self._view)
+        self._borrowed = {}
+        self._trajectory_atts = ()
         self._borrow_attribute(self._view, ['clear_representations',
                                             '_remove_representations_by_name',
                                             '_update_representations_by_name',
@@ -1224,6 +1610,28 @@ class ComponentViewer(object):
                                              'get_coordinates',
                                              'n_frames'])
 
+    def __getattr__(self, name):
+        """look up attributes borrowed from the view and the trajectory
+        """
+        if name not in ('_borrowed', '_trajectory_atts'):
+            try:
+                return self._borrowed[name]
+            except KeyError:
+                pass
+            if name in self._trajectory_atts:
+                # look up on access: e.g. n_frames changes when frames are added
+                traj = self._view._get_traj_by_id(self.id)
+                if traj is not None:
+                    return getattr(traj, name)
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (self.__class__.__name__, name))
+
+    def __dir__(self):
+        names = set(dir(self.__class__)) | set(self._borrowed)
+        if self._view._get_traj_by_id(self.id) is not None:
+            names.update(self._trajectory_atts)
+        return sorted(names)
+
     @property
     def id(self):
         return self._view._ngl_component_ids[self._index]
@@ -1231,43 +1639,43 @@ class ComponentViewer(object):
     def hide(self):
         """set invisibility for given components (by their indices)
         """
-        self._view._remote_call("setVisibility",
-                target='compList',
-                args=[False,],
-                kwargs={'component_index': self._index})
-        traj = self._view._get_traj_by_id(self.id)
-        if traj is not None:
-            traj.shown = False
+        self._set_visibility(False)
 
     def show(self):
         """set invisibility for given components (by their indices)
         """
-        self._view._remote_call("setVisibility",
-                target='compList',
-                args=[True,],
-                kwargs={'component_index': self._index})
+        self._set_visibility(True)
 
+    def _set_visibility(self, visible):
         traj = self._view._get_traj_by_id(self.id)
         if traj is not None:
-            traj.shown = True
+            traj.shown = visible
+
+        if self._view._visibilities.get(self.id, True) == visible:
+            return
+        self._view._visibilities[self.id] = visible
+        self._view._remote_call("setVisibility",
+                target='compList',
+                args=[visible,],
+                kwargs={'component_index': self._index})
 
     def add_representation(self, repr_type, selection='all', **kwargs):
         kwargs['component'] = self._index
         self._view.add_representation(repr_type=repr_type, selection=selection, **kwargs)
 
     def _borrow_attribute(self, view, attributes, trajectory_atts=None):
-        from functools import partial
-        from types import MethodType
-
-        traj = view._get_traj_by_id(self.id)
+        def make_func(view_func, index):
+            """return `view_func` with `component=index` as default
+            """
+            def func(*args, **kwargs):
+                kwargs.setdefault('component', index)
+                return view_func(*args, **kwargs)
+            func.__doc__ = view_func.__doc__
+            return func
 
+        borrowed = self._borrowed
         for attname in attributes:
-            view_att = getattr(view, attname)
-            setattr(self, '_' + attname, MethodType(view_att, view))
-            self_att = partial(getattr(view, attname), component=self._index)
-            setattr(self, attname, self_att) 
-
-        if traj is not None and trajectory_atts is not None:
-            for attname in trajectory_atts:
-                traj_att = getattr(traj, attname)
-                setattr(self, attname, traj_att) 
+            borrowed[attname] = make_func(getattr(view, attname), self._index)
+
+        if trajectory_atts is not None:
+            self._trajectory_atts = tuple(trajectory_atts)
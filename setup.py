@@ -168,6 +168,7 @@ setup_args = {
         "MDAnalysis": ["MDAnalysis"],
         "ParmEd": ["parmed"],
         "rdkit": ["rdkit"],
+        "pybase64": ["pybase64"],
     },
     'packages': set(find_packages() + ['nglview',
                  'nglview.static',